@@ -3,41 +3,213 @@
 Tile Generator for 360° Images
 Converts equirectangular images to multi-resolution cube map tiles
 Requires: Pillow (PIL), numpy
-Install: pip install Pillow numpy
+Optional: opencv-python (Lanczos resampling of cube faces),
+          PyTurboJPEG + libjpeg-turbo (faster JPEG encoding),
+          torch with CUDA (cube face sampling on the GPU),
+          numba (opt-in sampling map builder, use_numba=True)
+Install: pip install Pillow numpy opencv-python PyTurboJPEG
 """
 
+import contextlib
+import hashlib
+import math
+import multiprocessing
 import os
 import sys
-import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # Module missing, or installed without the libjpeg-turbo shared library
+    turbo_jpeg = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Face coordinates (s, t) to an unnormalized 3D direction for each face.
+# Coordinate system matches Three.js BoxGeometry
+FACE_AXES = {
+    'r': lambda s, t: (np.ones_like(s), -t, -s),   # Right (+X)
+    'l': lambda s, t: (-np.ones_like(s), -t, s),   # Left (-X)
+    'u': lambda s, t: (s, np.ones_like(s), t),     # Up/Top (+Y)
+    'd': lambda s, t: (s, -np.ones_like(s), -t),   # Down/Bottom (-Y)
+    'f': lambda s, t: (s, -t, np.ones_like(s)),    # Front (+Z)
+    'b': lambda s, t: (-s, -t, -np.ones_like(s)),  # Back (-Z)
+}
+
+
+def cuda_available():
+    """Whether torch is installed with a usable CUDA device; imports torch lazily"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def face_matrix(face_name):
+    """3x3 matrix M such that FACE_AXES[face_name](s, t) == M @ (1, s, t)"""
+    def direction(s, t):
+        return np.array(FACE_AXES[face_name](np.array([s]), np.array([t])), dtype=np.float64)[:, 0]
+    
+    origin = direction(0.0, 0.0)
+    return np.stack([origin, direction(1.0, 0.0) - origin, direction(0.0, 1.0) - origin], axis=1)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _map_face(matrix, face_size, out_u, out_v):
+        """Fill out_u, out_v with the equirectangular UV of every face pixel"""
+        for y in numba.prange(face_size):
+            t = np.float32((y + 0.5) / face_size * 2 - 1)
+            for x in range(face_size):
+                s = np.float32((x + 0.5) / face_size * 2 - 1)
+                vx = matrix[0, 0] + matrix[0, 1] * s + matrix[0, 2] * t
+                vy = matrix[1, 0] + matrix[1, 1] * s + matrix[1, 2] * t
+                vz = matrix[2, 0] + matrix[2, 1] * s + matrix[2, 2] * t
+                
+                # atan2 does not need a unit vector; asin(y) == atan2(y, |xz|)
+                horizontal = math.sqrt(vx * vx + vz * vz)
+                out_u[y, x] = np.float32(0.5) + math.atan2(vx, vz) / np.float32(2 * math.pi)
+                out_v[y, x] = np.float32(0.5) - math.atan2(vy, horizontal) / np.float32(math.pi)
+else:
+    _map_face = None
+
+
+def interleave_bits(x, y):
+    """Morton code of two 16-bit integers: the bits of x and y interleaved"""
+    def spread(n):
+        n &= 0xFFFF
+        n = (n | (n << 8)) & 0x00FF00FF
+        n = (n | (n << 4)) & 0x0F0F0F0F
+        n = (n | (n << 2)) & 0x33333333
+        n = (n | (n << 1)) & 0x55555555
+        return n
+    return spread(x) | (spread(y) << 1)
+
+
+def morton_order(num_tiles):
+    """All (tile_x, tile_y) of a num_tiles x num_tiles grid in Z order"""
+    coords = [(x, y) for y in range(num_tiles) for x in range(num_tiles)]
+    return sorted(coords, key=lambda p: interleave_bits(p[0], p[1]))
+
+
+# Extra columns wrapped around the source so the Lanczos kernel (8x8)
+# can sample across the 180° longitude seam
+WRAP_BORDER = 4
+
+# Side of the square blocks sampling maps are built in; a 256x256 block
+# keeps each float32 temporary at 256 KB
+MAP_BLOCK = 256
+
+# Default cap on scene worker processes; each one needs several hundred MB
+DEFAULT_MAX_WORKERS = 4
+
+# Source panorama file extensions picked up from the input folder
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'webp'}
+
+# Where the face UV lookup tables are cached between runs
+MAP_CACHE_DIR = Path.home() / '.cache' / 'virtualtour'
+
+# Part of the cached table's filename; bump when the UV formula changes
+LUT_FORMAT_VERSION = 1
+
 
 class TileGenerator:
-    def __init__(self, tile_size=512):
+    def __init__(self, tile_size=512, face_size=2048, cache_dir=MAP_CACHE_DIR,
+                 use_numba=False):
         self.tile_size = tile_size
+        self.face_size = face_size
+        self.cache_dir = cache_dir  # None disables the on-disk sampling map cache
+        
+        # The numba builder runs scalar trig, about 2.6x slower per core than
+        # NumPy's SIMD ufuncs, and pays a JIT compile on first use, so it is
+        # only worth it on many-core machines and must be asked for
+        if use_numba and _map_face is None:
+            print("Warning: numba is not installed, building sampling maps with NumPy",
+                  file=sys.stderr)
+        self.use_numba = use_numba and _map_face is not None
         self.face_names = ['f', 'r', 'b', 'l', 'u', 'd']
         
-    def generate_tiles_from_folder(self, source_folder, output_folder):
-        """Generate tiles for all images in source folder"""
+        # Sampling maps depend only on source and face size, so they are
+        # reused across images of the same resolution
+        self._maps = None
+        self._maps_key = None
+        
+        # Whether faces are sampled on the GPU; checked on first use, since
+        # importing torch alone takes over a second
+        self._use_gpu = None
+        
+        # (maps, grid) pair: the maps converted to a grid_sample grid on the GPU
+        self._gpu_grid = None
+        
+    def generate_tiles_from_folder(self, source_folder, output_folder, max_workers=None):
+        """
+        Generate tiles for all images in source folder
+        Images run in up to max_workers processes (default: CPU count, capped
+        at DEFAULT_MAX_WORKERS). Each worker holds its own copy of the sampling
+        maps (about 200 MB for 2048px faces) plus the decoded image, cube faces
+        and mip pyramid, roughly 0.5-1 GB per worker for an 8K panorama
+        """
         source_path = Path(source_folder)
         output_path = Path(output_folder)
         output_path.mkdir(exist_ok=True)
         
-        # Get all image files
-        image_files = list(source_path.glob('*.jpg')) + list(source_path.glob('*.png'))
+        # Get all image files in a single directory scan
+        with os.scandir(source_path) as entries:
+            image_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1][1:].lower() in IMAGE_EXTENSIONS
+            )
         
         print(f"Found {len(image_files)} images to process")
         
-        for idx, image_file in enumerate(image_files, 1):
-            print(f"\nProcessing {idx}/{len(image_files)}: {image_file.name}")
+        # Create scene IDs from filenames
+        image_paths = [str(image_file) for image_file in image_files]
+        scene_outputs = [str(output_path / image_file.stem.replace(' ', '_'))
+                         for image_file in image_files]
+        
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+        workers = min(max_workers, len(image_files))
+        
+        if workers <= 1:
+            for idx, image_file in enumerate(image_files, 1):
+                print(f"\nProcessing {idx}/{len(image_files)}: {image_file.name}")
+                self.generate_tiles_for_image(image_paths[idx - 1], scene_outputs[idx - 1])
+        else:
+            # Build the sampling maps once so every worker starts with them
+            with self._open_panorama(image_files[0]) as img:
+                width, height = img.size
+            self._get_maps(height, width, self.face_size)
             
-            # Create scene ID from filename
-            scene_id = image_file.stem.replace(' ', '_')
-            scene_output = output_path / scene_id
+            # Decide on the GPU once here, so workers without one never import torch
+            if self._use_gpu is None:
+                self._use_gpu = cuda_available()
             
-            self.generate_tiles_for_image(str(image_file), str(scene_output))
+            # Spawn rather than fork: a forked child inherits whatever thread
+            # pools the parent has started (numba, OpenCV), which can deadlock
+            print(f"Processing with {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                futures = [executor.submit(_generate_scene, image_path, scene_output)
+                           for image_path, scene_output in zip(image_paths, scene_outputs)]
+                for idx, future in enumerate(as_completed(futures), 1):
+                    print(f"Finished {idx}/{len(image_files)}: {Path(future.result()).name}")
             
         print("\n[OK] All tiles generated successfully!")
     
@@ -48,12 +220,12 @@ class TileGenerator:
         
         # Load equirectangular image
         print(f"  Loading image...")
-        img = Image.open(image_path)
-        img_array = np.array(img)
+        with self._open_panorama(image_path) as img:
+            img_array = np.asarray(img.convert('RGB'))
         
         # Convert to cube faces
         print(f"  Converting to cube faces...")
-        cube_faces = self.equirectangular_to_cube_faces(img_array)
+        cube_faces = self.equirectangular_to_cube_faces(img_array, self.face_size)
         
         # Generate multi-resolution levels
         levels = [
@@ -63,121 +235,324 @@ class TileGenerator:
             {'size': 2048, 'tile_size': 512, 'level': 3}
         ]
         
+        # Build mip chain once, largest level first
+        print(f"  Building mip pyramid...")
+        sizes = [level_info['size'] for level_info in levels]
+        pyramid = self.build_pyramid(cube_faces, sizes)
+        
         for level_info in levels:
             print(f"  Generating level {level_info['level']} ({level_info['size']}x{level_info['size']})...")
-            self.generate_level_tiles(cube_faces, output_dir, level_info)
+            self.generate_level_tiles(pyramid, output_dir, level_info)
         
         # Generate preview
         print(f"  Generating preview...")
-        self.generate_preview(cube_faces, output_dir)
+        self.generate_preview(pyramid, output_dir)
         
         print(f"  [OK] Done!")
     
+    def _open_panorama(self, image_path):
+        """
+        Open an equirectangular image, letting JPEGs decode at reduced scale
+        Face pixels are densest at the face edges, where one pixel spans
+        1/face_size radians, so a source wider than 2*pi*face_size carries no
+        extra detail; draft() decodes at 1/2, 1/4 or 1/8 DCT scale while
+        staying at or above that size
+        """
+        img = Image.open(image_path)
+        width = math.ceil(2 * math.pi * self.face_size)
+        img.draft('RGB', (width, width // 2))
+        return img
+    
     def equirectangular_to_cube_faces(self, img_array, face_size=2048):
-        """Convert equirectangular image to 6 cube faces"""
+        """Convert equirectangular image to 6 cube faces (uint8 arrays)"""
         height, width = img_array.shape[:2]
-        cube_faces = {}
+        maps = self._get_maps(height, width, face_size)
+        return self._sample_faces(img_array, maps)
+    
+    def _get_maps(self, height, width, face_size):
+        """Return sampling maps, rebuilding them only when the shape changes"""
+        key = (height, width, face_size)
+        if self._maps_key != key:
+            self._maps = self._build_maps(height, width, face_size)
+            self._maps_key = key
+        return self._maps
+    
+    def _build_maps(self, height, width, face_size):
+        """Build float32 (map_x, map_y) source coordinates for every face"""
+        lut = self._load_uv_lut(face_size)
+        maps = {}
+        
+        for idx, face_name in enumerate(self.face_names):
+            map_x = lut[idx, :, :, 0] * np.float32(width - 1)
+            map_y = lut[idx, :, :, 1] * np.float32(height - 1)
+            maps[face_name] = (map_x, map_y)
+        
+        return maps
+    
+    def _load_uv_lut(self, face_size):
+        """
+        Return the (6, face_size, face_size, 2) equirectangular UV lookup table
+        The table does not depend on the source resolution, so it is saved to
+        the cache directory once and loaded on later runs
+        """
+        if self.cache_dir is None:
+            print(f"    Building sampling maps ({face_size}x{face_size})...")
+            return self._build_uv_lut(face_size)
         
+        expected_shape = (len(self.face_names), face_size, face_size, 2)
+        cache_path = Path(self.cache_dir) / f"vt_maps_{self._uv_lut_tag()}_{face_size}.npy"
+        
+        if cache_path.exists():
+            try:
+                lut = np.load(cache_path)
+                if lut.shape == expected_shape and lut.dtype == np.float32:
+                    print(f"    Loading sampling maps from {cache_path}")
+                    return lut
+            except (OSError, ValueError):
+                pass
+        
+        print(f"    Building sampling maps ({face_size}x{face_size})...")
+        lut = self._build_uv_lut(face_size)
+        
+        # Write to a temporary file first so concurrent runs never read a partial table
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, lut)
+            os.replace(tmp_path, cache_path)
+            self._prune_uv_luts(face_size)
+        except OSError as e:
+            print(f"    Warning: could not cache sampling maps: {e}", file=sys.stderr)
+            tmp_path.unlink(missing_ok=True)
+        
+        return lut
+    
+    def _uv_lut_tag(self, builder=None):
+        """
+        Identify how the UV lookup table is computed, for its cache filename
+        Covers the format version, the builder and the face order and axes,
+        so a change to any of them rebuilds the cache instead of reusing it
+        """
+        digest = hashlib.sha1()
         for face_name in self.face_names:
-            print(f"    Processing face: {face_name}")
-            face = np.zeros((face_size, face_size, 3), dtype=np.uint8)
-            
-            for y in range(face_size):
-                for x in range(face_size):
-                    # Convert cube face coordinates to 3D vector
-                    vec = self.cube_face_to_vector(face_name, x, y, face_size)
+            digest.update(face_name.encode())
+            digest.update(face_matrix(face_name).tobytes())
+        if builder is None:
+            builder = 'numba' if self.use_numba else 'numpy'
+        return f"v{LUT_FORMAT_VERSION}_{builder}_{digest.hexdigest()[:12]}"
+    
+    def _prune_uv_luts(self, face_size):
+        """Delete cached tables of this face size left by other versions or axes"""
+        current = {f"vt_maps_{self._uv_lut_tag(builder)}_{face_size}.npy"
+                   for builder in ('numba', 'numpy')}
+        for path in Path(self.cache_dir).glob(f"vt_maps_*_{face_size}.npy"):
+            if path.name not in current:
+                path.unlink(missing_ok=True)
+    
+    def _build_uv_lut(self, face_size):
+        """Compute normalized equirectangular (u, v) for every pixel of every face"""
+        lut = np.empty((len(self.face_names), face_size, face_size, 2), dtype=np.float32)
+        
+        if self.use_numba:
+            # Compiled per-pixel loop, threaded over rows
+            for idx, face_name in enumerate(self.face_names):
+                matrix = face_matrix(face_name).astype(np.float32)
+                _map_face(matrix, face_size, lut[idx, :, :, 0], lut[idx, :, :, 1])
+            return lut
+        
+        # Pixel-center coordinates normalized to [-1, 1], shared by all faces.
+        # float32 is ample for pixel coordinates and lets NumPy's SIMD
+        # arctan2/arcsin process twice as many lanes as float64
+        coords = ((np.arange(face_size) + 0.5) / face_size * 2 - 1).astype(np.float32)
+        
+        for idx, face_name in enumerate(self.face_names):
+            # Work in blocks so the temporaries of every step stay in L2
+            for by in range(0, face_size, MAP_BLOCK):
+                for bx in range(0, face_size, MAP_BLOCK):
+                    rows = slice(by, by + MAP_BLOCK)
+                    cols = slice(bx, bx + MAP_BLOCK)
+                    s, t = np.meshgrid(coords[cols], coords[rows], indexing='xy')
                     
-                    # Convert 3D vector to equirectangular coordinates
-                    u, v = self.vector_to_equirectangular(vec)
+                    # Convert cube face coordinates to 3D vectors
+                    vec = self.cube_face_to_vector(face_name, s, t)
                     
-                    # Sample from source image
-                    src_x = int(u * (width - 1))
-                    src_y = int(v * (height - 1))
+                    # Convert 3D vectors to equirectangular coordinates
+                    u, v = self.vector_to_equirectangular(vec)
                     
-                    face[y, x] = img_array[src_y, src_x]
+                    lut[idx, rows, cols, 0] = u
+                    lut[idx, rows, cols, 1] = v
+        
+        return lut
+    
+    def _sample_faces(self, img_array, maps):
+        """Resample the equirectangular image through precomputed maps"""
+        if self._use_gpu is None:
+            self._use_gpu = cuda_available()
+        if self._use_gpu:
+            return self._sample_faces_gpu(img_array, maps)
+        
+        if cv2 is not None:
+            # Longitude wraps around, latitude does not: pad only the x-axis
+            src = cv2.copyMakeBorder(img_array, 0, 0, WRAP_BORDER, WRAP_BORDER,
+                                     cv2.BORDER_WRAP)
+        
+        def sample_face(face_name):
+            map_x, map_y = maps[face_name]
             
-            cube_faces[face_name] = Image.fromarray(face)
+            if cv2 is not None:
+                face = cv2.remap(src, map_x + WRAP_BORDER, map_y,
+                                 cv2.INTER_LANCZOS4,
+                                 borderMode=cv2.BORDER_REPLICATE)
+            else:
+                # Nearest-neighbor fallback when OpenCV is not installed
+                face = img_array[map_y.astype(np.int32), map_x.astype(np.int32)]
+            
+            return face
         
-        return cube_faces
+        face_names = list(maps)
+        print(f"    Processing faces: {', '.join(face_names)}")
+        faces = self._map_faces(sample_face, face_names)
+        return dict(zip(face_names, faces))
     
-    def cube_face_to_vector(self, face, x, y, size):
+    def _sample_faces_gpu(self, img_array, maps):
+        """Resample all faces in a single grid_sample call on the GPU"""
+        import torch
+        import torch.nn.functional as F
+        
+        height, width = img_array.shape[:2]
+        face_names = list(maps)
+        
+        if self._gpu_grid is None or self._gpu_grid[0] is not maps:
+            # grid_sample wants (x, y) in [-1, 1]; x is offset by the wrapped
+            # column added on each side of the source below
+            grid = np.stack([
+                np.stack([(maps[face_name][0] + 1) / (width + 1) * 2 - 1,
+                          maps[face_name][1] / (height - 1) * 2 - 1], axis=-1)
+                for face_name in face_names
+            ]).astype(np.float32)
+            self._gpu_grid = (maps, torch.from_numpy(grid).cuda())
+        grid = self._gpu_grid[1]
+        
+        print(f"    Processing faces on GPU: {', '.join(face_names)}")
+        img = torch.tensor(img_array, device='cuda').permute(2, 0, 1).unsqueeze(0).float()
+        
+        # Longitude wraps around: pad one column on each side of the x-axis
+        img = torch.cat([img[..., -1:], img, img[..., :1]], dim=3)
+        
+        faces = F.grid_sample(img.expand(len(face_names), -1, -1, -1), grid,
+                              mode='bilinear', padding_mode='border', align_corners=True)
+        faces = faces.round().clamp(0, 255).to(torch.uint8).permute(0, 2, 3, 1).cpu().numpy()
+        
+        return dict(zip(face_names, faces))
+    
+    def _map_faces(self, func, face_names):
         """
-        Convert cube face coordinates to 3D unit vector
-        Coordinate system matches Three.js BoxGeometry:
-        - r: Right face (+X)
-        - l: Left face (-X)
-        - u: Up/Top face (+Y)
-        - d: Down/Bottom face (-Y)
-        - f: Front face (+Z)
-        - b: Back face (-Z)
+        Call func once per face on a thread pool, returning results in order
+        cv2.remap and Pillow's resampling release the GIL, so faces run in parallel
         """
-        # Normalize coordinates to [-1, 1] range
-        s = (x + 0.5) / size * 2 - 1
-        t = (y + 0.5) / size * 2 - 1
-
-        # Map to 3D vectors (matching Three.js coordinate system)
-        if face == 'r':  # Right (+X)
-            vec = [1, -t, -s]
-        elif face == 'l':  # Left (-X)
-            vec = [-1, -t, s]
-        elif face == 'u':  # Up (+Y)
-            vec = [s, 1, t]
-        elif face == 'd':  # Down (-Y)
-            vec = [s, -1, -t]
-        elif face == 'f':  # Front (+Z)
-            vec = [s, -t, 1]
-        elif face == 'b':  # Back (-Z)
-            vec = [-s, -t, -1]
-        else:
-            vec = [0, 0, 1]
+        with ThreadPoolExecutor(max_workers=len(face_names)) as pool:
+            return list(pool.map(func, face_names))
+    
+    def cube_face_to_vector(self, face, s, t):
+        """
+        Convert cube face coordinates to 3D unit vectors
+        s, t are arrays of face coordinates normalized to [-1, 1]
+        """
+        x, y, z = FACE_AXES[face](s, t)
 
-        # Normalize to unit vector
-        length = math.sqrt(vec[0]**2 + vec[1]**2 + vec[2]**2)
-        return [vec[0]/length, vec[1]/length, vec[2]/length]
+        # Normalize to unit vectors
+        length = np.sqrt(x * x + y * y + z * z)
+        return x / length, y / length, z / length
     
     def vector_to_equirectangular(self, vec):
-        """Convert 3D vector to equirectangular UV coordinates"""
+        """Convert 3D vectors to equirectangular UV coordinates"""
         x, y, z = vec
-        u = 0.5 + math.atan2(x, z) / (2 * math.pi)
-        v = 0.5 - math.asin(y) / math.pi
+        u = 0.5 + np.arctan2(x, z) / (2 * np.pi)
+        v = 0.5 - np.arcsin(y) / np.pi
         return u, v
     
-    def generate_level_tiles(self, cube_faces, output_dir, level_info):
+    def build_pyramid(self, cube_faces, sizes):
+        """Build a mip chain for every face, keyed by face name then size"""
+        def build_face_levels(face_name):
+            levels = {}
+            current = cube_faces[face_name]
+            
+            # Each level is derived from the next larger one
+            for size in sorted(sizes, reverse=True):
+                if current.shape[0] != size:
+                    current = self._resize_face(current, size)
+                levels[size] = current
+            
+            return levels
+        
+        face_names = list(cube_faces)
+        face_levels = self._map_faces(build_face_levels, face_names)
+        return dict(zip(face_names, face_levels))
+    
+    def _resize_face(self, face, size):
+        """Resize a square face array; exact halving is a 2x box filter"""
+        if cv2 is not None:
+            # INTER_AREA averages 2x2 blocks on an exact halving, like a GPU mip minifier
+            interpolation = cv2.INTER_AREA if size < face.shape[0] else cv2.INTER_LANCZOS4
+            return cv2.resize(face, (size, size), interpolation=interpolation)
+        
+        img = Image.fromarray(face)
+        if img.size == (size * 2, size * 2):
+            img = img.reduce(2)
+        else:
+            img = img.resize((size, size), Image.LANCZOS)
+        return np.asarray(img)
+    
+    def generate_level_tiles(self, pyramid, output_dir, level_info):
         """Generate tiles for a specific resolution level"""
         level = level_info['level']
         size = level_info['size']
         tile_size = level_info['tile_size']
         
-        for face_name, face_img in cube_faces.items():
-            # Resize face to level size
-            resized_face = face_img.resize((size, size), Image.LANCZOS)
+        def save_face_tiles(face_name):
+            face = pyramid[face_name][size]
+            face_dir = output_dir / str(level) / face_name
+            
+            if size == tile_size:
+                # The face is its own single tile: encode it directly
+                (face_dir / '0').mkdir(parents=True, exist_ok=True)
+                self._save_jpeg(face_dir / '0' / '0.jpg', face)
+                return
             
             # Calculate number of tiles
-            num_tiles = max(1, size // tile_size)
+            num_tiles = -(-size // tile_size)
+            
+            # Pad to whole tiles with black if necessary
+            padded_size = num_tiles * tile_size
+            if padded_size != size:
+                padded = np.zeros((padded_size, padded_size) + face.shape[2:], dtype=face.dtype)
+                padded[:size, :size] = face
+                face = padded
+            
+            # View the face as a grid of tiles, indexed [tile_y, tile_x]
+            tiles = face.reshape(num_tiles, tile_size, num_tiles, tile_size, -1).swapaxes(1, 2)
             
-            # Split into tiles
             for tile_y in range(num_tiles):
-                for tile_x in range(num_tiles):
-                    # Extract tile
-                    left = tile_x * tile_size
-                    top = tile_y * tile_size
-                    right = min(left + tile_size, size)
-                    bottom = min(top + tile_size, size)
-                    
-                    tile = resized_face.crop((left, top, right, bottom))
-                    
-                    # Ensure tile is exactly tile_size (pad if necessary)
-                    if tile.size != (tile_size, tile_size):
-                        padded = Image.new('RGB', (tile_size, tile_size), (0, 0, 0))
-                        padded.paste(tile, (0, 0))
-                        tile = padded
-                    
-                    # Save tile
-                    tile_path = output_dir / str(level) / face_name / str(tile_y)
-                    tile_path.mkdir(parents=True, exist_ok=True)
-                    tile.save(tile_path / f"{tile_x}.jpg", quality=90, optimize=True)
+                (face_dir / str(tile_y)).mkdir(parents=True, exist_ok=True)
+            
+            # Visit tiles in Z order so neighbouring tiles are encoded together
+            for tile_x, tile_y in morton_order(num_tiles):
+                # Save tile
+                self._save_jpeg(face_dir / str(tile_y) / f"{tile_x}.jpg", tiles[tile_y, tile_x])
+        
+        self._map_faces(save_face_tiles, list(pyramid))
+    
+    def _save_jpeg(self, path, array, quality=90):
+        """Encode an RGB array to a JPEG file, using libjpeg-turbo when available"""
+        if turbo_jpeg is not None:
+            data = turbo_jpeg.encode(array, quality=quality, pixel_format=TJPF_RGB,
+                                     jpeg_subsample=TJSAMP_420)
+            path.write_bytes(data)
+        else:
+            Image.fromarray(array).save(path, quality=quality)
     
-    def generate_preview(self, cube_faces, output_dir):
+    def generate_preview(self, pyramid, output_dir):
         """Generate cube map preview image"""
         preview_size = 256
         
@@ -195,12 +570,47 @@ class TileGenerator:
         }
         
         for face_name, (x, y) in layout.items():
-            face_img = cube_faces[face_name].resize((preview_size, preview_size), Image.LANCZOS)
+            # The smallest mip level is normally exactly the preview size
+            face_levels = pyramid[face_name]
+            face = face_levels.get(preview_size)
+            if face is None:
+                face = self._resize_face(face_levels[max(face_levels)], preview_size)
+            face_img = Image.fromarray(face)
             canvas.paste(face_img, (x * preview_size, y * preview_size))
         
         canvas.save(output_dir / "preview.jpg", quality=85, optimize=True)
 
 
+# Generator shared by the tasks of a worker process, set by _init_worker
+_worker_generator = None
+
+
+def _init_worker(generator):
+    """Process pool initializer: receive the generator and its sampling maps"""
+    global _worker_generator
+    _worker_generator = generator
+    
+    # Parallelism comes from the processes and each one's per-face threads;
+    # OpenCV's own all-core pool on top would oversubscribe the CPU
+    if cv2 is not None:
+        cv2.setNumThreads(1)
+
+
+def _generate_scene(image_path, output_path):
+    """
+    Process pool task: generate tiles for one image
+    The per-stage progress lines carry no scene name, so they are discarded
+    here rather than interleaved with other workers' output
+    """
+    # A single write, so the line cannot be split by another process
+    sys.stdout.write(f"Processing: {Path(image_path).name}\n")
+    sys.stdout.flush()
+    
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _worker_generator.generate_tiles_for_image(image_path, output_path)
+    return image_path
+
+
 def main():
     if len(sys.argv) > 1:
         source_folder = sys.argv[1]